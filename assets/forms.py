@@ -2,12 +2,16 @@ from django import forms
 from django.contrib.auth.models import User
 from .models import Asset, AssetRequest
 
+# Shared widget attrs; Widget.__init__ copies attrs, so sharing these dicts is safe
+_FC = {'class': 'form-control'}
+_DATE_FC = {'type': 'date', **_FC}
+
 class AssetForm(forms.ModelForm):
     assigned_to = forms.ModelChoiceField(
-        queryset=User.objects.all(),
+        queryset=User.objects.only('id', 'username').order_by('username'),
         required=False,
         empty_label="Not Assigned",
-        widget=forms.Select(attrs={'class': 'form-control'})
+        widget=forms.Select(attrs=_FC)
     )
 
     class Meta:
@@ -28,29 +32,29 @@ class AssetForm(forms.ModelForm):
             'image'
         ]
         widgets = {
-            'serial_no': forms.TextInput(attrs={'class': 'form-control'}),
-            'purchase_date': forms.DateInput(attrs={'type': 'date', 'class': 'form-control'}),
-            'purchase_cost': forms.NumberInput(attrs={'class': 'form-control'}),
-            'condition': forms.TextInput(attrs={'class': 'form-control'}),
-            'depreciation': forms.NumberInput(attrs={'class': 'form-control'}),
-            'supplier': forms.TextInput(attrs={'class': 'form-control'}),
-            'warranty': forms.TextInput(attrs={'class': 'form-control'}),
+            'serial_no': forms.TextInput(attrs=_FC),
+            'purchase_date': forms.DateInput(attrs=_DATE_FC),
+            'purchase_cost': forms.NumberInput(attrs=_FC),
+            'condition': forms.TextInput(attrs=_FC),
+            'depreciation': forms.NumberInput(attrs=_FC),
+            'supplier': forms.TextInput(attrs=_FC),
+            'warranty': forms.TextInput(attrs=_FC),
 
             'description': forms.Textarea(attrs={
-                'class': 'form-control',
+                **_FC,
                 'rows': 4,
                 'placeholder': 'Enter a description of the asset...'
             }),
-            'category': forms.Select(attrs={'class': 'form-control'}),
-            'status': forms.Select(attrs={'class': 'form-control'}),
-            'department': forms.Select(attrs={'class': 'form-control'}),
-            'image': forms.FileInput(attrs={'class': 'form-control'})
+            'category': forms.Select(attrs=_FC),
+            'status': forms.Select(attrs=_FC),
+            'department': forms.Select(attrs=_FC),
+            'image': forms.FileInput(attrs=_FC)
         }
 
 class AssetRequestForm(forms.ModelForm):
     purpose = forms.CharField(
         widget=forms.Textarea(attrs={
-            'class': 'form-control',
+            **_FC,
             'rows': 3,
             'placeholder': 'Please explain why you need this asset...'
         }),
@@ -1,18 +1,25 @@
 from django.core.management.base import BaseCommand
+from django.db import transaction
 from assets.models import Asset
 
 class Command(BaseCommand):
     help = 'Updates asset numbers for existing assets'
 
     def handle(self, *args, **kwargs):
-        assets = Asset.objects.filter(asset_no__isnull=True)
-        count = 0
-        
-        for asset in assets:
-            if asset.department and asset.category:
-                asset.asset_no = asset.generate_asset_number()
-                asset.save()
-                count += 1
-                self.stdout.write(f'Updated asset number for asset {asset.id}: {asset.asset_no}')
-        
-        self.stdout.write(self.style.SUCCESS(f'Successfully updated {count} asset numbers')) 
\ No newline at end of file
+        assets = [
+            Asset(pk=asset_id, department_id=department_id, category=category)
+            for asset_id, department_id, category in Asset.objects.filter(
+                asset_no__isnull=True
+            ).values_list('id', 'department_id', 'category')
+            if department_id and category
+        ]
+
+        with transaction.atomic():
+            # One counter reservation per department/category, then one batched write
+            Asset.generate_asset_numbers_bulk(assets)
+            Asset.objects.bulk_update(assets, ['asset_no'], batch_size=500)
+
+        lines = [f'Updated asset number for asset {asset.pk}: {asset.asset_no}' for asset in assets]
+        if lines:
+            self.stdout.write('\n'.join(lines))
+        self.stdout.write(self.style.SUCCESS(f'Successfully updated {len(assets)} asset numbers'))
@@ -0,0 +1,44 @@
+# Generated by Django 5.2.1 on 2026-10-15 12:07
+
+import re
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def seed_asset_counters(apps, schema_editor):
+    Asset = apps.get_model('assets', 'Asset')
+    AssetCounter = apps.get_model('assets', 'AssetCounter')
+    last_numbers = {}
+    for department_id, category, asset_no in Asset.objects.values_list('department_id', 'category', 'asset_no'):
+        match = re.search(r'-(\d+)$', asset_no or '')
+        if match:
+            key = (department_id, category)
+            last_numbers[key] = max(last_numbers.get(key, 0), int(match.group(1)))
+    AssetCounter.objects.bulk_create([
+        AssetCounter(department_id=department_id, category=category, last_number=last_number)
+        for (department_id, category), last_number in last_numbers.items()
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assets', '0006_stocktake_stocktakeitem'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AssetCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('category', models.CharField(max_length=50)),
+                ('last_number', models.PositiveIntegerField(default=0)),
+                ('department', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='assets.department')),
+            ],
+            options={
+                'unique_together': {('department', 'category')},
+            },
+        ),
+        migrations.RunPython(seed_asset_counters, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,21 @@
+# Generated by Django 5.2.1 on 2026-10-15 12:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assets', '0007_assetcounter'),
+    ]
+
+    operations = [
+        migrations.AddConstraint(
+            model_name='asset',
+            constraint=models.CheckConstraint(condition=models.Q(('status__in', ['available', 'in_use', 'maintenance', 'retired'])), name='asset_status_valid'),
+        ),
+        migrations.AddConstraint(
+            model_name='asset',
+            constraint=models.CheckConstraint(condition=models.Q(('category__in', ['furniture', 'technology', 'vehicles', 'office_supplies', 'machinery'])), name='asset_category_valid'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.1 on 2026-10-15 12:39
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('assets', '0009_filter_column_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='asset',
+            index=models.Index(fields=['-created_at'], name='asset_created_idx'),
+        ),
+    ]
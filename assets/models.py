@@ -1,6 +1,15 @@
 from django.db import models, transaction
-from django.contrib.auth.models import User
+from django.db.models import F, IntegerField, Max, Q
+from django.db.models.functions import Cast, Greatest, Substr
 from django.db.utils import IntegrityError
+from django.contrib.auth.models import User
+
+def asset_no_prefix(department, category):
+    return f"{department}-{category}-KOTDA-"
+
+def format_asset_no(department, category, number):
+    # Format: [department]-[category]-KOTDA-[number]
+    return f"{asset_no_prefix(department, category)}{number:04d}"
 
 class Department(models.Model):
     name = models.CharField(max_length=100, unique=True)
@@ -8,21 +17,67 @@ class Department(models.Model):
     def __str__(self):
         return self.name
 
+class AssetCounter(models.Model):
+    department = models.ForeignKey(Department, on_delete=models.CASCADE)
+    category = models.CharField(max_length=50)
+    last_number = models.PositiveIntegerField(default=0)
+
+    def __str__(self):
+        return f"{self.department.name} - {self.category}: {self.last_number}"
+
+    @classmethod
+    def next_number(cls, department_id, category, count=1):
+        """Atomically reserve `count` numbers for a department/category and return the last one"""
+        counters = cls.objects.filter(department_id=department_id, category=category)
+        with transaction.atomic():
+            # The UPDATE takes the row lock itself, so no read-modify-write race on any backend
+            if not counters.update(last_number=F('last_number') + count):
+                try:
+                    with transaction.atomic():
+                        cls.objects.create(department_id=department_id, category=category, last_number=count)
+                    return count
+                except IntegrityError:
+                    # Another creator inserted the row first
+                    counters.update(last_number=F('last_number') + count)
+            return counters.values_list('last_number', flat=True).get()
+
+    @classmethod
+    def skip_used(cls, department_id, category, prefix):
+        """Move a counter past the highest number already used by asset numbers starting with `prefix`"""
+        last_used = Asset.objects.filter(asset_no__startswith=prefix).aggregate(
+            last=Max(Cast(Substr('asset_no', len(prefix) + 1), IntegerField()))
+        )['last']
+        if last_used:
+            cls.objects.filter(department_id=department_id, category=category).update(
+                last_number=Greatest(F('last_number'), last_used)
+            )
+
+    class Meta:
+        unique_together = ('department', 'category')
+
+class AssetStatus(models.TextChoices):
+    AVAILABLE = 'available', 'Available'
+    IN_USE = 'in_use', 'In Use'
+    MAINTENANCE = 'maintenance', 'Under Maintenance'
+    RETIRED = 'retired', 'Retired'
+
+class AssetCategory(models.TextChoices):
+    FURNITURE = 'furniture', 'Furniture'
+    TECHNOLOGY = 'technology', 'Technology'
+    VEHICLES = 'vehicles', 'Vehicles'
+    OFFICE_SUPPLIES = 'office_supplies', 'Office Supplies'
+    MACHINERY = 'machinery', 'Machinery / Equipment'
+
+class AssetManager(models.Manager):
+    def get_queryset(self):
+        return super().get_queryset().select_related('department', 'assigned_to')
+
 class Asset(models.Model):
-    STATUS_CHOICES = [
-        ('available', 'Available'),
-        ('in_use', 'In Use'),
-        ('maintenance', 'Under Maintenance'),
-        ('retired', 'Retired')
-    ]
+    Status = AssetStatus
+    Category = AssetCategory
 
-    CATEGORY_CHOICES = [
-        ('furniture', 'Furniture'),
-        ('technology', 'Technology'),
-        ('vehicles', 'Vehicles'),
-        ('office_supplies', 'Office Supplies'),
-        ('machinery', 'Machinery / Equipment')
-    ]
+    STATUS_CHOICES = Status.choices
+    CATEGORY_CHOICES = Category.choices
 
     asset_no = models.CharField(max_length=50, unique=True, editable=False, default='TEMP-ASSET-0000')
     serial_no = models.CharField(max_length=100, null=True, blank=True)
@@ -34,70 +89,58 @@ class Asset(models.Model):
     warranty = models.CharField(max_length=100, null=True, blank=True)
 
     description = models.TextField(blank=True)
-    category = models.CharField(max_length=50, choices=CATEGORY_CHOICES)
+    category = models.CharField(max_length=50, choices=Category.choices)
     department = models.ForeignKey(Department, on_delete=models.CASCADE)
-    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='available')
+    status = models.CharField(max_length=20, choices=Status.choices, default=Status.AVAILABLE)
     assigned_to = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='assigned_assets')
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
     image = models.ImageField(upload_to='assets/', null=True, blank=True)
 
-    def generate_asset_number(self):
-        if not self.department or not self.category:
-            raise ValueError("Department and Category are required to generate asset number")
-
-        max_attempts = 10
-        attempt = 0
-        
-        while attempt < max_attempts:
-            try:
-                # Get the last asset number for this department and category
-                last_asset = Asset.objects.filter(
-                    department=self.department,
-                    category=self.category
-                ).order_by('-asset_no').first()
-
-                if last_asset and last_asset.asset_no:
-                    try:
-                        # Extract the number from the last asset number
-                        last_number = int(last_asset.asset_no.split('-')[-1])
-                        new_number = last_number + 1
-                    except (ValueError, IndexError):
-                        new_number = 1
-                else:
-                    new_number = 1
-
-                # Format: [department]-[category]-KOTDA-[number]
-                asset_no = f"{self.department.name}-{self.category}-KOTDA-{new_number:04d}"
-                
-                # Try to save with this number
-                try:
-                    with transaction.atomic():
-                        # Double check if number exists
-                        if not Asset.objects.filter(asset_no=asset_no).exists():
-                            return asset_no
-                except IntegrityError:
-                    pass
-                
-                # If we get here, either the number exists or we got an integrity error
-                # Try the next number
-                attempt += 1
-                continue
-                    
-            except Exception:
-                attempt += 1
-                continue
-                
-        raise ValueError("Could not generate a unique asset number after multiple attempts")
-
-    def save(self, *args, **kwargs):
-        super().save(*args, **kwargs)
+    objects = AssetManager()
+
+    @classmethod
+    def generate_asset_numbers_bulk(cls, assets):
+        """Set asset_no on many assets, reserving one block of numbers per department/category"""
+        groups = {}
+        for asset in assets:
+            if not asset.department_id or not asset.category:
+                raise ValueError("Department and Category are required to generate asset number")
+            groups.setdefault((asset.department_id, asset.category), []).append(asset)
+
+        department_names = dict(
+            Department.objects.filter(pk__in={department_id for department_id, _ in groups}).values_list('id', 'name')
+        )
+        for (department_id, category), group in groups.items():
+            last_number = AssetCounter.next_number(department_id, category, count=len(group))
+            department_name = department_names[department_id]
+            for number, asset in enumerate(group, start=last_number - len(group) + 1):
+                asset.asset_no = format_asset_no(department_name, category, number)
 
     def __str__(self):
         return f"{self.asset_no} ({self.category})"
 
     class Meta:
         ordering = ['-created_at']
+        indexes = [
+            # Single-column filters used by the list, report and export views
+            models.Index(fields=['status'], name='asset_status_idx'),
+            models.Index(fields=['purchase_date'], name='asset_purchase_date_idx'),
+            # Category and status are usually filtered together in asset_list and reports;
+            # also serves category-only filters
+            models.Index(fields=['category', 'status'], name='asset_cat_status_idx'),
+            # Default ordering; lets "newest N" queries stop after N index entries
+            models.Index(fields=['-created_at'], name='asset_created_idx'),
+        ]
+        # Enforced by the database so bulk_create/bulk_update paths (which skip full_clean) stay valid
+        constraints = [
+            models.CheckConstraint(condition=Q(status__in=AssetStatus.values), name='asset_status_valid'),
+            models.CheckConstraint(condition=Q(category__in=AssetCategory.values), name='asset_category_valid'),
+        ]
+
+class AssetRequestManager(models.Manager):
+    def get_queryset(self):
+        return super().get_queryset().select_related('asset', 'asset__department', 'user')
 
 class AssetRequest(models.Model):
     asset = models.ForeignKey(Asset, on_delete=models.CASCADE, related_name='requests')
@@ -107,11 +150,19 @@ class AssetRequest(models.Model):
     approved = models.BooleanField(null=True, blank=True)
     approval_date = models.DateTimeField(null=True, blank=True)
 
+    objects = AssetRequestManager()
+
     def __str__(self):
         return f"Request for {self.asset.serial_no} by {self.user.username}"
 
     class Meta:
         ordering = ['-request_date']
+        indexes = [
+            models.Index(fields=['request_date'], name='ar_request_date_idx'),
+            # Pending queue (approved IS NULL) and approved/rejected history, newest first;
+            # also serves approved-only filters and the pending count
+            models.Index(fields=['approved', '-request_date'], name='ar_approved_date_idx'),
+        ]
 
 class StockTake(models.Model):
     STATUS_CHOICES = [
@@ -0,0 +1,20 @@
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+
+from .models import Asset, AssetRequest
+
+# Cached asset/request counts shown on the dashboard
+DASHBOARD_SUMMARY_KEY = 'dashboard:summary'
+
+
+def invalidate_dashboard_summary():
+    """Drop the cached dashboard counts once the current transaction commits"""
+    transaction.on_commit(lambda: cache.delete(DASHBOARD_SUMMARY_KEY))
+
+
+@receiver([post_save, post_delete], sender=Asset)
+@receiver([post_save, post_delete], sender=AssetRequest)
+def clear_dashboard_summary(sender, **kwargs):
+    invalidate_dashboard_summary()
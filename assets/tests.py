@@ -1,3 +1,114 @@
+from django.contrib.auth.models import User
 from django.test import TestCase
+from django.urls import reverse
 
-# Create your tests here.
+from .models import Asset, AssetCounter, AssetRequest, Department, StockTake, StockTakeItem
+
+
+class AssetCreateTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser('admin', 'admin@example.com', 'pw')
+        self.client.force_login(self.admin)
+
+    def create_asset(self, department):
+        return self.client.post(reverse('asset_create'), {
+            'category': 'technology', 'department': department.pk, 'status': 'available',
+        })
+
+    def test_departments_sharing_a_prefix_do_not_block_each_other(self):
+        it_department, _ = Department.objects.get_or_create(name='IT Department')
+        for _ in range(12):
+            self.create_asset(it_department)
+
+        # "IT Support" shares the "IT " prefix, so its first numbers are already taken
+        it_support, _ = Department.objects.get_or_create(name='IT Support')
+        for _ in range(2):
+            response = self.create_asset(it_support)
+            self.assertEqual(response.status_code, 302)
+
+        self.assertEqual(
+            list(Asset.objects.filter(department=it_support).order_by('asset_no').values_list('asset_no', flat=True)),
+            ['IT -TEC-KOTDA-0013', 'IT -TEC-KOTDA-0014'],
+        )
+        self.assertEqual(AssetCounter.objects.get(department=it_support).last_number, 14)
+
+
+class AssetListSearchTests(TestCase):
+    def setUp(self):
+        self.client.force_login(User.objects.create_user('user', 'user@example.com', 'pw'))
+        department, _ = Department.objects.get_or_create(name='IT Department')
+        Asset.objects.create(asset_no='IT -TEC-KOTDA-0001', category='technology', department=department)
+        Asset.objects.create(asset_no='IT -MAC-KOTDA-0001', category='machinery', department=department, status='in_use')
+
+    def search(self, query):
+        response = self.client.get(reverse('asset_list'), {'q': query})
+        self.assertEqual(response.status_code, 200)
+        return sorted(asset.asset_no for asset in response.context['page_obj'])
+
+    def test_search_matches_asset_number_and_choice_labels(self):
+        self.assertEqual(self.search('TEC-KOTDA'), ['IT -TEC-KOTDA-0001'])
+        self.assertEqual(self.search('equipment'), ['IT -MAC-KOTDA-0001'])
+        self.assertEqual(self.search('in use'), ['IT -MAC-KOTDA-0001'])
+        self.assertEqual(self.search('it department'), ['IT -MAC-KOTDA-0001', 'IT -TEC-KOTDA-0001'])
+
+
+class RequestAssetTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user('user', 'user@example.com', 'pw')
+        self.client.force_login(self.user)
+        department, _ = Department.objects.get_or_create(name='IT Department')
+        self.asset = Asset.objects.create(asset_no='IT -TEC-KOTDA-0001', category='technology', department=department)
+
+    def request_asset(self, data):
+        return self.client.post(
+            reverse('request_asset', kwargs={'pk': self.asset.pk}), data, headers={'X-Requested-With': 'XMLHttpRequest'}
+        )
+
+    def test_duplicate_pending_request_is_rejected(self):
+        self.assertEqual(self.request_asset({'purpose': 'Field work'}).json(), {'success': True})
+
+        response = self.request_asset({'purpose': 'Field work'})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['errors'], {'__all__': ['You already have a pending request for this asset.']})
+        self.assertEqual(AssetRequest.objects.filter(asset=self.asset, user=self.user).count(), 1)
+
+    def test_invalid_request_returns_field_errors(self):
+        response = self.request_asset({'purpose': ''})
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json(), {'success': False, 'errors': {'purpose': ['This field is required.']}})
+        self.assertFalse(AssetRequest.objects.exists())
+
+
+class StockTakeDetailTests(TestCase):
+    def setUp(self):
+        self.admin = User.objects.create_superuser('admin', 'admin@example.com', 'pw')
+        self.client.force_login(self.admin)
+        department, _ = Department.objects.get_or_create(name='IT Department')
+        self.stock_take = StockTake.objects.create(department=department, created_by=self.admin)
+        self.items = [
+            StockTakeItem.objects.create(
+                stock_take=self.stock_take,
+                asset=Asset.objects.create(asset_no=f'IT -TEC-KOTDA-{number:04d}', category='technology', department=department),
+            )
+            for number in range(1, 4)
+        ]
+
+    def count(self, data):
+        return self.client.post(reverse('stock_take_detail', kwargs={'pk': self.stock_take.pk}), data)
+
+    def test_discrepancy_before_an_uncounted_item(self):
+        first, second, third = self.items
+        self.count({
+            f'quantity_{first.id}': 1,
+            f'quantity_{second.id}': 2,
+            f'quantity_{third.id}': 0,
+        })
+        self.stock_take.refresh_from_db()
+        self.assertEqual(self.stock_take.status, 'discrepancy')
+
+    def test_quantities_only_completes_the_stock_take(self):
+        response = self.count({f'quantity_{item.id}': 1 for item in self.items})
+        self.assertRedirects(response, reverse('stock_take_list'))
+        self.stock_take.refresh_from_db()
+        self.assertEqual(self.stock_take.status, 'completed')
+        self.assertEqual(set(self.stock_take.items.values_list('actual_quantity', 'notes')), {(1, '')})
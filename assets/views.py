@@ -2,27 +2,121 @@ from django.shortcuts import render, redirect, get_object_or_404
 from django.contrib import messages
 from django.contrib.auth.decorators import login_required
 from django.utils import timezone
-from .models import Asset, AssetRequest, Department, StockTake, StockTakeItem
+from .models import Asset, AssetCounter, AssetRequest, Department, StockTake, StockTakeItem, asset_no_prefix, format_asset_no
 from .forms import AssetForm, AssetRequestForm
 from .decorators import admin_required
+from .signals import DASHBOARD_SUMMARY_KEY, invalidate_dashboard_summary
 from django.contrib.auth import login
 from django.contrib.auth.models import User
 from django.conf import settings
+from django.core.cache import cache
+from django.core.paginator import Paginator
 from django.db.models import Q
 from django.http import JsonResponse
-from django.http import HttpResponse
+from django.http import FileResponse, StreamingHttpResponse
 from reportlab.pdfgen import canvas
 from reportlab.lib import colors
 from reportlab.lib.pagesizes import letter, landscape
 from reportlab.platypus import SimpleDocTemplate, Table, TableStyle, Paragraph, Spacer, Image
 from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
-from django.db.models import Count, Sum, Avg, F
+from django.db.models import Count, Sum, Avg, F, Exists, OuterRef, Value, Case, When, CharField
 from django.db.models.functions import TruncMonth
 from io import BytesIO
 from datetime import datetime
 from django.db import transaction
 from django.db.utils import IntegrityError
 import os
+import tempfile
+from functools import lru_cache
+
+def _choice_label(field, choices):
+    """CASE expression that returns the human-readable label of a choice field"""
+    return Case(
+        *[When(**{field: value}, then=Value(label)) for value, label in choices],
+        default=field,
+        output_field=CharField()
+    )
+
+# Choice-derived values are fixed at import time, so build them once per process.
+# The CASE expressions are copied when a queryset resolves them, so sharing is safe.
+CATEGORY_LABEL = _choice_label('category', Asset.CATEGORY_CHOICES)
+STATUS_LABEL = _choice_label('status', Asset.STATUS_CHOICES)
+# (value, lowercased label) pairs for matching search terms against choices
+CATEGORY_SEARCH_TERMS = tuple((value, label.lower()) for value, label in Asset.CATEGORY_CHOICES)
+STATUS_SEARCH_TERMS = tuple((value, label.lower()) for value, label in Asset.STATUS_CHOICES)
+
+# Columns rendered in the asset list, including the joined department and assignee
+ASSET_LIST_FIELDS = (
+    'asset_no', 'serial_no', 'purchase_date', 'purchase_cost', 'condition', 'depreciation',
+    'supplier', 'warranty', 'description', 'category', 'status',
+    'department__name', 'assigned_to__username', 'assigned_to__first_name', 'assigned_to__last_name',
+)
+
+# Columns rendered in the reports asset table, including the joined department and assignee
+REPORT_ASSET_FIELDS = (
+    'asset_no', 'serial_no', 'category', 'status', 'purchase_date', 'purchase_cost',
+    'department__name', 'assigned_to__first_name', 'assigned_to__last_name',
+)
+
+# Stock take columns rendered by stock_take_detail, including the joined department and creator
+STOCK_TAKE_DETAIL_FIELDS = (
+    'date', 'status', 'notes',
+    'department__name', 'created_by__username', 'created_by__first_name', 'created_by__last_name',
+)
+
+def _paginate(request, queryset, param='page', per_page=25, count=None):
+    """Return one page of a queryset, reading the page number from request.GET[param]"""
+    paginator = Paginator(queryset, per_page)
+    if count is not None:
+        # Caller already knows the row count; skip the paginator's own COUNT query
+        paginator.count = count
+    page_obj = paginator.get_page(request.GET.get(param))
+    # Keep the other query parameters (filters, other lists' pages) in the page links
+    query = request.GET.copy()
+    query.pop(param, None)
+    page_obj.param = param
+    page_obj.query_prefix = f'{query.urlencode()}&' if query else ''
+    return page_obj
+
+def _asset_stats(assets):
+    """Return (total, total value, utilization %) for a queryset of assets in one query"""
+    stats = assets.aggregate(
+        total=Count('id'),
+        in_use=Count('id', filter=Q(status='in_use')),
+        value=Sum('purchase_cost'),
+    )
+    total = stats['total']
+    utilization_rate = (stats['in_use'] / total * 100) if total else 0
+    return total, stats['value'] or 0, utilization_rate
+
+REPORT_FILTER_PARAMS = ('department', 'category', 'status', 'start_date', 'end_date')
+
+def _report_filters(params):
+    """Read the report filter values from the query string, in display order"""
+    return {key: params.get(key) for key in REPORT_FILTER_PARAMS}
+
+def _apply_report_filters(queryset, filters, prefix='', date_field='purchase_date'):
+    """Filter assets (or a model related to them through prefix) by the report filters"""
+    if filters['department']:
+        queryset = queryset.filter(**{f'{prefix}department__name': filters['department']})
+    if filters['category']:
+        queryset = queryset.filter(**{f'{prefix}category': filters['category']})
+    if filters['status']:
+        queryset = queryset.filter(**{f'{prefix}status': filters['status']})
+    # The date range applies to date_field on the queryset's own model
+    if filters['start_date']:
+        queryset = queryset.filter(**{f'{date_field}__gte': filters['start_date']})
+    if filters['end_date']:
+        queryset = queryset.filter(**{f'{date_field}__lte': filters['end_date']})
+    return queryset
+
+def _asset_breakdown(assets, name):
+    """Count, value and in-use count per group of assets, grouped by the name expression in SQL"""
+    return assets.values(name=name).annotate(
+        total=Count('id'),
+        value=Sum('purchase_cost'),
+        in_use=Count('id', filter=Q(status='in_use')),
+    ).order_by('name')
 
 # landing page
 def landing_page(request):
@@ -37,16 +131,23 @@ def asset_list(request):
     category_filter = request.GET.get('category', '')
     status_filter = request.GET.get('status', '')
     
-    assets = Asset.objects.all()
+    # The default manager joins department and assigned_to, so rows render without extra queries;
+    # only the columns the list shows are loaded (no image, timestamps or user credentials)
+    assets = Asset.objects.only(*ASSET_LIST_FIELDS)
     
     # Apply search query
     if query:
+        # Category and status are resolved against their labels here and matched by exact code
+        term = query.lower()
+        matching_categories = [value for value, label in CATEGORY_SEARCH_TERMS if term in value or term in label]
+        matching_statuses = [value for value, label in STATUS_SEARCH_TERMS if term in value or term in label]
         assets = assets.filter(
-            Q(name__icontains=query) |
+            Q(asset_no__icontains=query) |
+            Q(serial_no__icontains=query) |
             Q(description__icontains=query) |
-            Q(category__icontains=query) |
             Q(department__name__icontains=query) |
-            Q(status__icontains=query)
+            Q(category__in=matching_categories) |
+            Q(status__in=matching_statuses)
         )
     
     # Apply category filter
@@ -62,7 +163,7 @@ def asset_list(request):
     statuses = Asset.STATUS_CHOICES
     
     return render(request, 'assets/asset_list.html', {
-        'assets': assets,
+        'page_obj': _paginate(request, assets),
         'search_query': query,
         'categories': categories,
         'statuses': statuses,
@@ -73,15 +174,16 @@ def asset_list(request):
 @login_required
 def asset_detail(request, pk):
     """View to show details of a specific asset"""
-    asset = get_object_or_404(Asset, pk=pk)
-    can_request = not AssetRequest.objects.filter(
-        asset=asset,
+    # Fetch the asset and whether this user already has a pending request for it in one query
+    pending = AssetRequest.objects.filter(
+        asset=OuterRef('pk'),
         user=request.user,
         approved__isnull=True
-    ).exists()
+    )
+    asset = get_object_or_404(Asset.objects.annotate(has_pending_request=Exists(pending)), pk=pk)
     return render(request, 'assets/asset_detail.html', {
         'asset': asset,
-        'can_request': can_request
+        'can_request': not asset.has_pending_request
     })
 
 
@@ -100,33 +202,25 @@ def asset_create(request):
                         messages.error(request, 'Department and Category are required to generate asset number.')
                         return render(request, 'assets/asset_form.html', {'form': form, 'action': 'Create'})
                     
-                    # Get the last asset number for this department and category
-                    last_asset = Asset.objects.filter(
-                        department=asset.department,
-                        category=asset.category
-                    ).order_by('-asset_no').first()
-
-                    if last_asset and last_asset.asset_no:
-                        try:
-                            # Extract the number from the last asset number
-                            last_number = int(last_asset.asset_no.split('-')[-1])
-                            new_number = last_number + 1
-                        except (ValueError, IndexError):
-                            new_number = 1
-                    else:
-                        new_number = 1
-
-                    # Format: [department]-[category]-KOTDA-[number]
                     dept_prefix = asset.department.name[:3].upper()
                     cat_prefix = asset.category[:3].upper()
-                    asset.asset_no = f"{dept_prefix}-{cat_prefix}-KOTDA-{new_number:04d}"
-                    
-                    # Verify this number doesn't exist
-                    while Asset.objects.filter(asset_no=asset.asset_no).exists():
-                        new_number += 1
-                        asset.asset_no = f"{dept_prefix}-{cat_prefix}-KOTDA-{new_number:04d}"
-                    
-                    asset.save()
+
+                    # Numbers come from the department/category counter row, whose UPDATE serialises
+                    # concurrent creates. Departments sharing a 3-letter prefix share the number
+                    # space, so on a collision the counter skips past the highest number in use
+                    while True:
+                        new_number = AssetCounter.next_number(asset.department_id, asset.category)
+                        asset.asset_no = format_asset_no(dept_prefix, cat_prefix, new_number)
+                        try:
+                            with transaction.atomic():
+                                asset.save(force_insert=True)
+                            break
+                        except IntegrityError:
+                            if not Asset.objects.filter(asset_no=asset.asset_no).exists():
+                                raise
+                            AssetCounter.skip_used(
+                                asset.department_id, asset.category, asset_no_prefix(dept_prefix, cat_prefix)
+                            )
                 messages.success(request, 'Asset created successfully!')
                 return redirect('asset_detail', pk=asset.pk)
             except IntegrityError as e:
@@ -175,20 +269,28 @@ def request_asset(request, pk):
     asset = get_object_or_404(Asset, pk=pk)
     
     if request.method == 'POST':
+        is_ajax = request.headers.get('X-Requested-With') == 'XMLHttpRequest'
         form = AssetRequestForm(request.POST)
         if form.is_valid():
-            asset_request = form.save(commit=False)
-            asset_request.asset = asset
-            asset_request.user = request.user
-            asset_request.save()
-            
-            # Return JSON response for AJAX request
-            if request.headers.get('X-Requested-With') == 'XMLHttpRequest':
-                return JsonResponse({'success': True})
-            
-            # Fallback for non-AJAX requests
-            messages.success(request, 'Asset request submitted successfully!')
-            return redirect('asset_list')
+            # Early out if the user is still waiting on an earlier request for this asset
+            if AssetRequest.objects.filter(asset=asset, user=request.user, approved__isnull=True).exists():
+                form.add_error(None, 'You already have a pending request for this asset.')
+                if not is_ajax:
+                    messages.error(request, 'You already have a pending request for this asset.')
+            else:
+                AssetRequest.objects.create(asset=asset, user=request.user, **form.cleaned_data)
+                
+                # Return JSON response for AJAX request
+                if is_ajax:
+                    return JsonResponse({'success': True})
+                
+                # Fallback for non-AJAX requests
+                messages.success(request, 'Asset request submitted successfully!')
+                return redirect('asset_list')
+        
+        # AJAX callers only need the errors, not a rendered page
+        if is_ajax:
+            return JsonResponse({'success': False, 'errors': form.errors}, status=400)
     else:
         form = AssetRequestForm()
     
@@ -201,34 +303,46 @@ def request_asset(request, pk):
 @admin_required
 def manage_requests(request):
     """View to manage asset requests"""
-    pending_requests = AssetRequest.objects.filter(approved__isnull=True)
-    approved_requests = AssetRequest.objects.filter(approved=True)
-    rejected_requests = AssetRequest.objects.filter(approved=False)
+    # The default manager joins user, asset and asset department for every list
+    requests = AssetRequest.objects.all()
+    pending_requests = requests.filter(approved__isnull=True)
+    approved_requests = requests.filter(approved=True)
+    rejected_requests = requests.filter(approved=False)
     
+    # Each list pages independently; the history lists keep their five-item view
     return render(request, 'assets/manage_requests.html', {
-        'pending_requests': pending_requests,
-        'approved_requests': approved_requests,
-        'rejected_requests': rejected_requests
+        'pending_requests': _paginate(request, pending_requests, 'pending_page'),
+        'approved_requests': _paginate(request, approved_requests, 'approved_page', per_page=5),
+        'rejected_requests': _paginate(request, rejected_requests, 'rejected_page', per_page=5)
     })
 
 @login_required
 @admin_required
 def process_request(request, request_id, action):
     """View to approve or reject asset requests"""
-    asset_request = get_object_or_404(AssetRequest, pk=request_id)
-    
-    if action == 'approve':
-        asset_request.approved = True
-        asset_request.asset.assigned_to = asset_request.user
-        asset_request.asset.status = 'in_use'
-        asset_request.asset.save()
+    # Only the foreign keys are needed; both writes below are targeted UPDATEs
+    asset_request = get_object_or_404(
+        AssetRequest.objects.select_related(None).only('asset', 'user'),
+        pk=request_id
+    )
+    approved = action == 'approve'
+    now = timezone.now()
+    
+    with transaction.atomic():
+        if approved:
+            Asset.objects.filter(pk=asset_request.asset_id).update(
+                assigned_to_id=asset_request.user_id,
+                status='in_use',
+                updated_at=now
+            )
+        AssetRequest.objects.filter(pk=asset_request.pk).update(approved=approved, approval_date=now)
+        # QuerySet.update() sends no signals, so refresh the dashboard counts explicitly
+        invalidate_dashboard_summary()
+    
+    if approved:
         message = 'Request approved successfully!'
     else:
-        asset_request.approved = False
         message = 'Request rejected successfully!'
-    
-    asset_request.approval_date = timezone.now()
-    asset_request.save()
     messages.success(request, message)
     return redirect('manage_requests')
 
@@ -246,92 +360,93 @@ def switch_user(request):
         return redirect(request.META.get('HTTP_REFERER', 'asset_list'))
     return redirect('asset_list')
 
+SWITCHER_USERS_KEY = 'debug:switcher_users'
+
 def get_context_data(request):
     """Add available users to context"""
     context = {}
     if settings.DEBUG:
-        context['available_users'] = User.objects.all().order_by('-is_staff', 'username')
+        # Runs on every render, so keep a short-lived, bounded list of just what the switcher shows
+        users = cache.get(SWITCHER_USERS_KEY)
+        if users is None:
+            users = [
+                {'id': user_id, 'name': f'{first_name} {last_name}'.strip() or username, 'is_staff': is_staff}
+                for user_id, username, first_name, last_name, is_staff in User.objects.order_by(
+                    '-is_staff', 'username'
+                ).values_list('id', 'username', 'first_name', 'last_name', 'is_staff')[:500]
+            ]
+            cache.set(SWITCHER_USERS_KEY, users, 30)
+        context['available_users'] = users
         context['debug'] = True
     return context
 
 @login_required
 def dashboard(request):
+    # The counts are cached briefly and dropped whenever an asset or request changes
+    summary = cache.get(DASHBOARD_SUMMARY_KEY)
+    if summary is None:
+        # One pass over the asset table for all three counts
+        asset_stats = Asset.objects.aggregate(
+            total=Count('id'),
+            available=Count('id', filter=Q(status='available')),
+            assigned=Count('id', filter=Q(status='in_use')),
+        )
+        summary = {
+            'total_assets': asset_stats['total'],
+            'available_assets': asset_stats['available'],
+            'pending_requests': AssetRequest.objects.filter(approved__isnull=True).count(),
+            'assigned_assets': asset_stats['assigned'],
+        }
+        cache.set(DASHBOARD_SUMMARY_KEY, summary, 60)
     context = {
-        'total_assets': Asset.objects.count(),
-        'available_assets': Asset.objects.filter(status='available').count(),
-        'pending_requests': AssetRequest.objects.filter(approved__isnull=True).count(),
-        'assigned_assets': Asset.objects.filter(status='in_use').count(),
-        'recent_assets': Asset.objects.all()[:5],
-        'recent_requests': AssetRequest.objects.all()[:5],
+        **summary,
+        # The recent lists only render a few columns each, newest first from an index
+        'recent_assets': Asset.objects.select_related(None).only(
+            'image', 'category', 'status'
+        ).order_by('-created_at')[:5],
+        'recent_requests': AssetRequest.objects.select_related(None).select_related('asset', 'user').only(
+            'request_date', 'approved', 'asset__id', 'user__username', 'user__first_name', 'user__last_name'
+        ).order_by('-request_date')[:5],
     }
     return render(request, 'assets/dashboard.html', context)
 
 @login_required
 def reports(request):
     # Get filter parameters
-    department = request.GET.get('department')
-    category = request.GET.get('category')
-    status = request.GET.get('status')
-    start_date = request.GET.get('start_date')
-    end_date = request.GET.get('end_date')
-
-    # Base queryset
-    assets = Asset.objects.all()
-    requests = AssetRequest.objects.all()
+    filters = _report_filters(request.GET)
 
-    # Apply filters
-    if department:
-        assets = assets.filter(department__name=department)
-        requests = requests.filter(asset__department__name=department)
-    
-    if category:
-        assets = assets.filter(category=category)
-        requests = requests.filter(asset__category=category)
-    
-    if status:
-        assets = assets.filter(status=status)
-        requests = requests.filter(asset__status=status)
-    
-    if start_date:
-        assets = assets.filter(purchase_date__gte=start_date)
-        requests = requests.filter(request_date__gte=start_date)
-    
-    if end_date:
-        assets = assets.filter(purchase_date__lte=end_date)
-        requests = requests.filter(request_date__lte=end_date)
+    # Base queryset, limited to the columns the report table renders
+    assets = _apply_report_filters(Asset.objects.only(*REPORT_ASSET_FIELDS), filters)
+    requests = _apply_report_filters(AssetRequest.objects.all(), filters, prefix='asset__', date_field='request_date')
 
-    # Calculate summary statistics
-    total_assets = assets.count()
-    total_value = assets.aggregate(total=Sum('purchase_cost'))['total'] or 0
-    utilization_rate = (assets.filter(status='in_use').count() / total_assets * 100) if total_assets > 0 else 0
+    # Calculate summary statistics in a single pass over the filtered assets
+    total_assets, total_value, utilization_rate = _asset_stats(assets)
     avg_response_time = requests.filter(approved__isnull=False).aggregate(
         avg_time=Avg(F('approval_date') - F('request_date'))
     )['avg_time'] or 0
 
+    # Per-department and per-category totals, one row per group
+    by_dept = _asset_breakdown(assets, F('department__name'))
+    by_category = _asset_breakdown(assets, CATEGORY_LABEL)
+
     # Get filter options
     departments = Department.objects.all()
     categories = Asset.CATEGORY_CHOICES
     statuses = Asset.STATUS_CHOICES
 
-    # Current filters for template
-    current_filters = {
-        'department': department,
-        'category': category,
-        'status': status,
-        'start_date': start_date,
-        'end_date': end_date
-    }
-
     context = {
-        'assets': assets,
+        # Only the current page of the asset table is fetched; the summary covers every filtered asset
+        'assets': _paginate(request, assets, count=total_assets),
         'total_assets': total_assets,
         'total_value': total_value,
         'utilization_rate': round(utilization_rate, 1),
         'avg_response_time': round(avg_response_time.days if avg_response_time else 0, 1),
+        'by_dept': by_dept,
+        'by_category': by_category,
         'departments': departments,
         'categories': categories,
         'statuses': statuses,
-        'current_filters': current_filters
+        'current_filters': filters
     }
 
     return render(request, 'assets/reports.html', context)
@@ -343,31 +458,16 @@ def download_report(request):
     report_type = request.GET.get('type', 'all')
     
     # Get all filter parameters
-    department = request.GET.get('department')
-    category = request.GET.get('category')
-    status = request.GET.get('status')
-    start_date = request.GET.get('start_date')
-    end_date = request.GET.get('end_date')
-    
-    # Base queryset
-    assets = Asset.objects.all()
-    
-    # Apply all filters
-    if department:
-        assets = assets.filter(department__name=department)
-    if category:
-        assets = assets.filter(category=category)
-    if status:
-        assets = assets.filter(status=status)
-    if start_date:
-        assets = assets.filter(purchase_date__gte=start_date)
-    if end_date:
-        assets = assets.filter(purchase_date__lte=end_date)
-    
-    # Calculate summary statistics
-    total_assets = assets.count()
-    total_value = assets.aggregate(total=Sum('purchase_cost'))['total'] or 0
-    utilization_rate = (assets.filter(status='in_use').count() / total_assets * 100) if total_assets > 0 else 0
+    filters = _report_filters(request.GET)
+    
+    # Base queryset; category and status labels come back from the database ready to export
+    assets = _apply_report_filters(Asset.objects.annotate(
+        category_label=CATEGORY_LABEL,
+        status_label=STATUS_LABEL
+    ), filters)
+    
+    # Calculate summary statistics in a single pass over the filtered assets
+    total_assets, total_value, utilization_rate = _asset_stats(assets)
     
     # Prepare the data for export
     export_data = {
@@ -378,13 +478,7 @@ def download_report(request):
             'utilization_rate': round(utilization_rate, 1)
         },
         'assets': assets,
-        'filters': {
-            'department': department,
-            'category': category,
-            'status': status,
-            'start_date': start_date,
-            'end_date': end_date
-        }
+        'filters': filters
     }
     
     if format_type == 'csv':
@@ -394,64 +488,100 @@ def download_report(request):
     else:
         return generate_pdf_report(request, export_data)
 
+def _export_asset_rows(assets):
+    """Yield one tuple of display values per asset, reading plain columns in chunks"""
+    rows = assets.values_list(
+        'asset_no', 'serial_no', 'category_label', 'department__name', 'status_label',
+        'purchase_date', 'purchase_cost', 'assigned_to__first_name', 'assigned_to__last_name'
+    ).iterator(chunk_size=2000)
+    for asset_no, serial_no, category, department, status, purchase_date, purchase_cost, first_name, last_name in rows:
+        yield (
+            asset_no,
+            serial_no,
+            category,
+            department,
+            status,
+            purchase_date.strftime('%B %d, %Y') if purchase_date else 'Not Set',
+            purchase_cost,
+            # Names are NULL only when there is no assignee (same as User.get_full_name otherwise)
+            f'{first_name} {last_name}'.strip() if first_name is not None else 'Not Assigned'
+        )
+
+# Generated PDF/Excel files stay in memory up to this size, then spill to a temp file
+REPORT_SPOOL_MAX_SIZE = 5 * 1024 * 1024
+
+def _report_spool():
+    """Temporary file for building a binary report; FileResponse closes it once sent"""
+    return tempfile.SpooledTemporaryFile(max_size=REPORT_SPOOL_MAX_SIZE)
+
+# Asset rows joined into each chunk of a streamed CSV export
+CSV_STREAM_BLOCK_ROWS = 500
+
+class _Echo:
+    """Pseudo-buffer whose write() returns the line, so csv.writer output can be streamed"""
+    def write(self, value):
+        return value
+
 def generate_csv_report(request, data):
     """Generate CSV report"""
     import csv
-    from django.http import HttpResponse
-    
-    response = HttpResponse(content_type='text/csv')
-    response['Content-Disposition'] = f'attachment; filename="asset_report_{datetime.now().strftime("%Y%m%d")}.csv"'
-    
-    writer = csv.writer(response)
     
-    # Write title and generation date
-    writer.writerow([data['title']])
-    writer.writerow(['Generated on: ' + datetime.now().strftime('%B %d, %Y')])
-    writer.writerow([])
-    
-    # Write summary statistics
-    writer.writerow(['Summary Statistics'])
-    writer.writerow(['Total Assets', data['summary']['total_assets']])
-    writer.writerow(['Total Value', f"${data['summary']['total_value']:.2f}"])
-    writer.writerow(['Utilization Rate', f"{data['summary']['utilization_rate']}%"])
-    writer.writerow([])
-    
-    # Write active filters
-    writer.writerow(['Active Filters'])
-    filters = data['filters']
-    if any(filters.values()):
-        for key, value in filters.items():
-            if value:
-                writer.writerow([key.replace('_', ' ').title(), value])
-    else:
-        writer.writerow(['No filters applied'])
-    writer.writerow([])
+    writer = csv.writer(_Echo())
     
-    # Write asset details
-    writer.writerow(['Asset Details'])
-    writer.writerow(['Asset No', 'Serial No', 'Category', 'Department', 'Status', 'Purchase Date', 'Purchase Cost', 'Assigned To'])
-    
-    for asset in data['assets']:
-        writer.writerow([
-            asset.asset_no,
-            asset.serial_no,
-            asset.get_category_display(),
-            asset.department.name,
-            asset.get_status_display(),
-            asset.purchase_date.strftime('%B %d, %Y') if asset.purchase_date else 'Not Set',
-            f"${asset.purchase_cost:.2f}" if asset.purchase_cost else 'Not Set',
-            asset.assigned_to.get_full_name() if asset.assigned_to else 'Not Assigned'
-        ])
+    def rows():
+        # Write title and generation date
+        yield writer.writerow([data['title']])
+        yield writer.writerow(['Generated on: ' + datetime.now().strftime('%B %d, %Y')])
+        yield writer.writerow([])
+        
+        # Write summary statistics
+        yield writer.writerow(['Summary Statistics'])
+        yield writer.writerow(['Total Assets', data['summary']['total_assets']])
+        yield writer.writerow(['Total Value', f"${data['summary']['total_value']:.2f}"])
+        yield writer.writerow(['Utilization Rate', f"{data['summary']['utilization_rate']}%"])
+        yield writer.writerow([])
+        
+        # Write active filters
+        yield writer.writerow(['Active Filters'])
+        filters = data['filters']
+        if any(filters.values()):
+            for key, value in filters.items():
+                if value:
+                    yield writer.writerow([key.replace('_', ' ').title(), value])
+        else:
+            yield writer.writerow(['No filters applied'])
+        yield writer.writerow([])
+        
+        # Write asset details, fetched in chunks so memory stays flat for large exports
+        yield writer.writerow(['Asset Details'])
+        yield writer.writerow(['Asset No', 'Serial No', 'Category', 'Department', 'Status', 'Purchase Date', 'Purchase Cost', 'Assigned To'])
+        
+        # Send rows in blocks so the server writes a few large chunks instead of one per line
+        block = []
+        for *cells, purchase_cost, assigned_to in _export_asset_rows(data['assets']):
+            block.append(writer.writerow([
+                *cells,
+                f"${purchase_cost:.2f}" if purchase_cost else 'Not Set',
+                assigned_to
+            ]))
+            if len(block) == CSV_STREAM_BLOCK_ROWS:
+                yield ''.join(block)
+                block = []
+        if block:
+            yield ''.join(block)
+    
+    response = StreamingHttpResponse(rows(), content_type='text/csv')
+    response['Content-Disposition'] = f'attachment; filename="asset_report_{datetime.now().strftime("%Y%m%d")}.csv"'
     
     return response
 
 def generate_excel_report(request, data):
     """Generate Excel report"""
     import xlsxwriter
-    from io import BytesIO
     
-    output = BytesIO()
-    workbook = xlsxwriter.Workbook(output)
+    output = _report_spool()
+    # constant_memory flushes each row once the next one starts, so rows must be written in order
+    workbook = xlsxwriter.Workbook(output, {'constant_memory': True})
     worksheet = workbook.add_worksheet()
     
     # Add formatting
@@ -495,147 +625,173 @@ def generate_excel_report(request, data):
     # Set row height for better spacing
     worksheet.set_default_row(20)
     
+    # Adjust column widths
+    worksheet.set_column('A:A', 15)  # Asset No
+    worksheet.set_column('B:B', 20)  # Serial No
+    worksheet.set_column('C:C', 20)  # Category
+    worksheet.set_column('D:D', 20)  # Department
+    worksheet.set_column('E:E', 15)  # Status
+    worksheet.set_column('F:F', 15)  # Purchase Date
+    worksheet.set_column('G:G', 15)  # Purchase Cost
+    worksheet.set_column('H:H', 25)  # Assigned To
+    
     # Write title
-    worksheet.merge_range('A1:H1', data['title'], title_format)
-    worksheet.write('A2', 'Generated on: ' + datetime.now().strftime('%B %d, %Y'))
-    worksheet.write('A4', '')
+    worksheet.merge_range(0, 0, 0, 7, data['title'], title_format)
+    worksheet.write(1, 0, 'Generated on: ' + datetime.now().strftime('%B %d, %Y'))
     
     # Write summary statistics
-    worksheet.write('A5', 'Summary Statistics', summary_format)
-    worksheet.write('A6', 'Total Assets', cell_format)
-    worksheet.write('B6', data['summary']['total_assets'], cell_format)
-    worksheet.write('A7', 'Total Value', cell_format)
-    worksheet.write('B7', data['summary']['total_value'], currency_format)
-    worksheet.write('A8', 'Utilization Rate', cell_format)
-    worksheet.write('B8', f"{data['summary']['utilization_rate']}%", cell_format)
-    worksheet.write('A10', '')
+    worksheet.write(4, 0, 'Summary Statistics', summary_format)
+    worksheet.write_row(5, 0, ['Total Assets', data['summary']['total_assets']], cell_format)
+    worksheet.write(6, 0, 'Total Value', cell_format)
+    worksheet.write(6, 1, data['summary']['total_value'], currency_format)
+    worksheet.write_row(7, 0, ['Utilization Rate', f"{data['summary']['utilization_rate']}%"], cell_format)
     
     # Write active filters
-    worksheet.write('A11', 'Active Filters', summary_format)
-    row = 12
+    worksheet.write(10, 0, 'Active Filters', summary_format)
+    row = 11
     filters = data['filters']
     if any(filters.values()):
         for key, value in filters.items():
             if value:
-                worksheet.write(f'A{row}', key.replace('_', ' ').title(), cell_format)
-                worksheet.write(f'B{row}', value, cell_format)
+                worksheet.write_row(row, 0, [key.replace('_', ' ').title(), value], cell_format)
                 row += 1
     else:
-        worksheet.write(f'A{row}', 'No filters applied', cell_format)
+        worksheet.write(row, 0, 'No filters applied', cell_format)
     row += 2
     
     # Write asset details
-    worksheet.write(f'A{row}', 'Asset Details', summary_format)
+    worksheet.write(row, 0, 'Asset Details', summary_format)
     row += 1
     
     # Write headers
     headers = ['Asset No', 'Serial No', 'Category', 'Department', 'Status', 'Purchase Date', 'Purchase Cost', 'Assigned To']
-    for col, header in enumerate(headers):
-        worksheet.write(row, col, header, header_format)
+    worksheet.write_row(row, 0, headers, header_format)
+    header_row = row
     row += 1
     
     # Write asset data
-    for asset in data['assets']:
-        worksheet.write(row, 0, asset.asset_no, cell_format)
-        worksheet.write(row, 1, asset.serial_no, cell_format)
-        worksheet.write(row, 2, asset.get_category_display(), cell_format)
-        worksheet.write(row, 3, asset.department.name, cell_format)
-        worksheet.write(row, 4, asset.get_status_display(), cell_format)
-        worksheet.write(row, 5, asset.purchase_date.strftime('%B %d, %Y') if asset.purchase_date else 'Not Set', cell_format)
-        worksheet.write(row, 6, asset.purchase_cost if asset.purchase_cost else 'Not Set', currency_format if asset.purchase_cost else cell_format)
-        worksheet.write(row, 7, asset.assigned_to.get_full_name() if asset.assigned_to else 'Not Assigned', cell_format)
+    for *cells, purchase_cost, assigned_to in _export_asset_rows(data['assets']):
+        worksheet.write_row(row, 0, cells, cell_format)
+        worksheet.write(row, 6, purchase_cost if purchase_cost else 'Not Set', currency_format if purchase_cost else cell_format)
+        worksheet.write(row, 7, assigned_to, cell_format)
         row += 1
     
-    # Adjust column widths
-    worksheet.set_column('A:A', 15)  # Asset No
-    worksheet.set_column('B:B', 20)  # Serial No
-    worksheet.set_column('C:C', 20)  # Category
-    worksheet.set_column('D:D', 20)  # Department
-    worksheet.set_column('E:E', 15)  # Status
-    worksheet.set_column('F:F', 15)  # Purchase Date
-    worksheet.set_column('G:G', 15)  # Purchase Cost
-    worksheet.set_column('H:H', 25)  # Assigned To
-    
     # Add filters
-    worksheet.autofilter(f'A{row-len(data["assets"])-1}:H{row-1}')
+    worksheet.autofilter(header_row, 0, row - 1, 7)
     
     # Freeze the header row
-    worksheet.freeze_panes(row - len(data['assets']), 0)
+    worksheet.freeze_panes(header_row + 1, 0)
     
     workbook.close()
     output.seek(0)
     
-    response = HttpResponse(
-        output.read(),
+    return FileResponse(
+        output,
+        as_attachment=True,
+        filename=f'asset_report_{datetime.now().strftime("%Y%m%d")}.xlsx',
         content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet'
     )
-    response['Content-Disposition'] = f'attachment; filename="asset_report_{datetime.now().strftime("%Y%m%d")}.xlsx"'
-    
-    return response
+
+# PDF report colors, to match website theme
+PDF_PRIMARY_COLOR = colors.HexColor('#005B4F')  # Your website's green
+PDF_TEXT_COLOR = colors.HexColor('#2c3e50')
+PDF_BORDER_COLOR = colors.HexColor('#e0e0e0')
+PDF_LIGHT_BG = colors.HexColor('#e8f5e9')  # Light green background
+
+# Table styles are immutable once built, so every report reuses the same instances
+PDF_KEY_VALUE_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, -1), colors.white),
+    ('TEXTCOLOR', (0, 0), (-1, -1), PDF_TEXT_COLOR),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, -1), 8),
+    ('GRID', (0, 0), (-1, -1), 1, PDF_BORDER_COLOR),
+    ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
+    ('TOPPADDING', (0, 0), (-1, -1), 4),
+])
+PDF_ASSET_TABLE_STYLE = TableStyle([
+    ('BACKGROUND', (0, 0), (-1, 0), PDF_PRIMARY_COLOR),
+    ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
+    ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
+    ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
+    ('FONTSIZE', (0, 0), (-1, 0), 8),
+    ('BOTTOMPADDING', (0, 0), (-1, 0), 6),
+    ('BACKGROUND', (0, 1), (-1, -1), colors.white),
+    ('TEXTCOLOR', (0, 1), (-1, -1), PDF_TEXT_COLOR),
+    ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
+    ('FONTSIZE', (0, 1), (-1, -1), 7),
+    ('GRID', (0, 0), (-1, -1), 1, PDF_BORDER_COLOR),
+    ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, PDF_LIGHT_BG]),
+    ('BOTTOMPADDING', (0, 1), (-1, -1), 4),
+    ('TOPPADDING', (0, 1), (-1, -1), 4),
+    ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
+])
+# Asset cells are single-line strings, so a fixed row height spares ReportLab measuring each row
+PDF_ASSET_ROW_HEIGHT = 18
+# Rows per asset table: small tables keep each wrap/split pass cheap, since ReportLab re-lays
+# out what is left of a table every time it splits one across a page. Tables still split
+# (the first starts below the summary), so each repeats its header. An even count keeps
+# the alternating row colours continuous across tables
+PDF_ASSET_TABLE_ROWS = 30
+
+# Paragraph styles, built once like the table styles above
+_pdf_styles = getSampleStyleSheet()
+PDF_TITLE_STYLE = ParagraphStyle(
+    'CustomTitle',
+    parent=_pdf_styles['Heading1'],
+    fontSize=18,
+    textColor=PDF_TEXT_COLOR,
+    spaceAfter=15,
+    alignment=1  # Center alignment
+)
+PDF_HEADING_STYLE = ParagraphStyle(
+    'CustomHeading',
+    parent=_pdf_styles['Heading2'],
+    fontSize=12,
+    textColor=PDF_PRIMARY_COLOR,
+    spaceBefore=12,
+    spaceAfter=8
+)
+PDF_NORMAL_STYLE = ParagraphStyle(
+    'CustomNormal',
+    parent=_pdf_styles['Normal'],
+    textColor=PDF_TEXT_COLOR,
+    fontSize=8,
+    spaceBefore=6,
+    spaceAfter=6
+)
+
+@lru_cache(maxsize=1)
+def _pdf_logo():
+    """Logo bytes for PDF reports, read from disk once per process (None if missing)"""
+    logo_path = os.path.join(settings.STATIC_ROOT, 'img', 'konza.png')
+    if not os.path.exists(logo_path):
+        return None
+    with open(logo_path, 'rb') as logo_file:
+        return logo_file.read()
 
 def generate_pdf_report(request, data):
     """Generate PDF report"""
-    buffer = BytesIO()
+    buffer = _report_spool()
     # Use landscape orientation for better data display
     doc = SimpleDocTemplate(buffer, pagesize=landscape(letter), rightMargin=20, leftMargin=20, topMargin=20, bottomMargin=20)
     
     # Container for the 'Flowable' objects
     elements = []
     
-    # Define colors to match website theme
-    primary_color = colors.HexColor('#005B4F')  # Your website's green
-    text_color = colors.HexColor('#2c3e50')
-    text_muted = colors.HexColor('#90a4ae')
-    border_color = colors.HexColor('#e0e0e0')
-    light_bg = colors.HexColor('#e8f5e9')  # Light green background
-    
-    # Define custom styles
-    styles = getSampleStyleSheet()
-    
-    # Title style
-    title_style = ParagraphStyle(
-        'CustomTitle',
-        parent=styles['Heading1'],
-        fontSize=18,
-        textColor=text_color,
-        spaceAfter=15,
-        alignment=1  # Center alignment
-    )
-    
-    # Heading style
-    heading_style = ParagraphStyle(
-        'CustomHeading',
-        parent=styles['Heading2'],
-        fontSize=12,
-        textColor=primary_color,
-        spaceBefore=12,
-        spaceAfter=8
-    )
-    
-    # Normal text style
-    normal_style = ParagraphStyle(
-        'CustomNormal',
-        parent=styles['Normal'],
-        textColor=text_color,
-        fontSize=8,
-        spaceBefore=6,
-        spaceAfter=6
-    )
-
     # Add logo
-    logo_path = os.path.join(settings.STATIC_ROOT, 'img', 'konza.png')
-    if os.path.exists(logo_path):
-        img = Image(logo_path, width=60, height=30)
-        elements.append(img)
+    logo = _pdf_logo()
+    if logo:
+        elements.append(Image(BytesIO(logo), width=60, height=30))
         elements.append(Spacer(1, 10))
     
     # Add title and generation date
-    elements.append(Paragraph(data['title'], title_style))
-    elements.append(Paragraph(f"Generated on: {datetime.now().strftime('%B %d, %Y')}", normal_style))
+    elements.append(Paragraph(data['title'], PDF_TITLE_STYLE))
+    elements.append(Paragraph(f"Generated on: {datetime.now().strftime('%B %d, %Y')}", PDF_NORMAL_STYLE))
     elements.append(Spacer(1, 10))
     
     # Add summary statistics
-    elements.append(Paragraph("Summary Statistics", heading_style))
+    elements.append(Paragraph("Summary Statistics", PDF_HEADING_STYLE))
     summary_data = [
         ['Total Assets', str(data['summary']['total_assets'])],
         ['Total Value', f"${data['summary']['total_value']:.2f}"],
@@ -643,21 +799,12 @@ def generate_pdf_report(request, data):
     ]
     
     summary_table = Table(summary_data, colWidths=[150, 100])
-    summary_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, -1), colors.white),
-        ('TEXTCOLOR', (0, 0), (-1, -1), text_color),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 8),
-        ('GRID', (0, 0), (-1, -1), 1, border_color),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
-        ('TOPPADDING', (0, 0), (-1, -1), 4),
-    ]))
+    summary_table.setStyle(PDF_KEY_VALUE_TABLE_STYLE)
     elements.append(summary_table)
     elements.append(Spacer(1, 10))
     
     # Add active filters
-    elements.append(Paragraph("Active Filters", heading_style))
+    elements.append(Paragraph("Active Filters", PDF_HEADING_STYLE))
     filters = data['filters']
     if any(filters.values()):
         filter_data = [[key.replace('_', ' ').title(), value] for key, value in filters.items() if value]
@@ -665,35 +812,13 @@ def generate_pdf_report(request, data):
         filter_data = [['No filters applied', '']]
     
     filter_table = Table(filter_data, colWidths=[150, 100])
-    filter_table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, -1), colors.white),
-        ('TEXTCOLOR', (0, 0), (-1, -1), text_color),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, -1), 8),
-        ('GRID', (0, 0), (-1, -1), 1, border_color),
-        ('BOTTOMPADDING', (0, 0), (-1, -1), 4),
-        ('TOPPADDING', (0, 0), (-1, -1), 4),
-    ]))
+    filter_table.setStyle(PDF_KEY_VALUE_TABLE_STYLE)
     elements.append(filter_table)
     elements.append(Spacer(1, 10))
     
     # Add asset details
-    elements.append(Paragraph("Asset Details", heading_style))
-    
-    # Prepare table data
-    table_data = [['Asset No', 'Serial No', 'Category', 'Department', 'Status', 'Purchase Date', 'Purchase Cost', 'Assigned To']]
-    for asset in data['assets']:
-        table_data.append([
-            asset.asset_no,
-            asset.serial_no,
-            asset.get_category_display(),
-            asset.department.name,
-            asset.get_status_display(),
-            asset.purchase_date.strftime('%B %d, %Y') if asset.purchase_date else 'Not Set',
-            f"${asset.purchase_cost:.2f}" if asset.purchase_cost else 'Not Set',
-            asset.assigned_to.get_full_name() if asset.assigned_to else 'Not Assigned'
-        ])
+    details_heading = Paragraph("Asset Details", PDF_HEADING_STYLE)
+    elements.append(details_heading)
     
     # Calculate column widths based on page width (landscape)
     page_width = letter[1] - 40  # Subtract margins (using height since we're in landscape)
@@ -707,48 +832,57 @@ def generate_pdf_report(request, data):
         page_width * 0.10,  # Purchase Cost
         page_width * 0.16   # Assigned To
     ]
-    
-    table = Table(table_data, colWidths=col_widths, repeatRows=1)
-    
-    # Style the table
-    table.setStyle(TableStyle([
-        ('BACKGROUND', (0, 0), (-1, 0), primary_color),
-        ('TEXTCOLOR', (0, 0), (-1, 0), colors.white),
-        ('ALIGN', (0, 0), (-1, -1), 'LEFT'),
-        ('FONTNAME', (0, 0), (-1, 0), 'Helvetica-Bold'),
-        ('FONTSIZE', (0, 0), (-1, 0), 8),
-        ('BOTTOMPADDING', (0, 0), (-1, 0), 6),
-        ('BACKGROUND', (0, 1), (-1, -1), colors.white),
-        ('TEXTCOLOR', (0, 1), (-1, -1), text_color),
-        ('FONTNAME', (0, 1), (-1, -1), 'Helvetica'),
-        ('FONTSIZE', (0, 1), (-1, -1), 7),
-        ('GRID', (0, 0), (-1, -1), 1, border_color),
-        ('ROWBACKGROUNDS', (0, 1), (-1, -1), [colors.white, light_bg]),
-        ('BOTTOMPADDING', (0, 1), (-1, -1), 4),
-        ('TOPPADDING', (0, 1), (-1, -1), 4),
-        ('VALIGN', (0, 0), (-1, -1), 'MIDDLE'),
-    ]))
-    elements.append(table)
+    header = ['Asset No', 'Serial No', 'Category', 'Department', 'Status', 'Purchase Date', 'Purchase Cost', 'Assigned To']
+    
+    def add_asset_table(rows):
+        table = Table(
+            [header] + rows,
+            colWidths=col_widths,
+            rowHeights=[PDF_ASSET_ROW_HEIGHT] * (len(rows) + 1),
+            repeatRows=1
+        )
+        table.setStyle(PDF_ASSET_TABLE_STYLE)
+        elements.append(table)
+    
+    # Fetch assets in chunks and emit one table per PDF_ASSET_TABLE_ROWS rows,
+    # so ReportLab lays out several small tables instead of one huge one
+    table_rows = []
+    for *cells, purchase_cost, assigned_to in _export_asset_rows(data['assets']):
+        table_rows.append([
+            *cells,
+            f"${purchase_cost:.2f}" if purchase_cost else 'Not Set',
+            assigned_to
+        ])
+        if len(table_rows) == PDF_ASSET_TABLE_ROWS:
+            add_asset_table(table_rows)
+            table_rows = []
+    # Remaining rows; an export with no assets still gets the header row
+    if table_rows or elements[-1] is details_heading:
+        add_asset_table(table_rows)
     
     # Build PDF
     doc.build(elements)
     
-    # Get the value of the BytesIO buffer and write it to the response
-    pdf = buffer.getvalue()
-    buffer.close()
-    response = HttpResponse(content_type='application/pdf')
-    response['Content-Disposition'] = f'attachment; filename="asset_report_{datetime.now().strftime("%Y%m%d")}.pdf"'
-    response.write(pdf)
-    
-    return response
+    # Stream the finished file from the spool instead of copying it into the response
+    buffer.seek(0)
+    return FileResponse(
+        buffer,
+        as_attachment=True,
+        filename=f'asset_report_{datetime.now().strftime("%Y%m%d")}.pdf',
+        content_type='application/pdf'
+    )
 
 @login_required
 @admin_required
 def clear_request_history(request):
     """View to clear processed request history"""
     if request.method == 'POST':
-        # Only clear processed requests (approved or rejected)
-        AssetRequest.objects.filter(approved__isnull=False).delete()
+        # Only clear processed requests (approved or rejected).
+        # Nothing references AssetRequest, so issue a single DELETE instead of going
+        # through the deletion collector. This skips the post_delete dashboard
+        # invalidation, which is fine: the cached counts only include pending requests.
+        processed = AssetRequest.objects.select_related(None).filter(approved__isnull=False)
+        processed._raw_delete(processed.db)
         messages.success(request, 'Request history cleared successfully!')
     return redirect('manage_requests')
 
@@ -778,16 +912,14 @@ def stock_take_create(request):
                     created_by=request.user
                 )
                 
-                # Get all assets for the department
-                assets = Asset.objects.filter(department_id=department_id)
+                # Only the ids of the department's assets are needed
+                asset_ids = Asset.objects.filter(department_id=department_id).values_list('pk', flat=True)
                 
-                # Create stock take items for each asset
-                for asset in assets:
-                    StockTakeItem.objects.create(
-                        stock_take=stock_take,
-                        asset=asset,
-                        expected_quantity=1
-                    )
+                # Create stock take items for each asset in batched INSERTs
+                StockTakeItem.objects.bulk_create([
+                    StockTakeItem(stock_take=stock_take, asset_id=asset_id, expected_quantity=1)
+                    for asset_id in asset_ids
+                ], batch_size=500)
                 
                 messages.success(request, 'Stock take record created successfully!')
                 return redirect('stock_take_detail', pk=stock_take.pk)
@@ -800,44 +932,79 @@ def stock_take_create(request):
         'action': 'Create'
     })
 
+# Status codes stock_take_update accepts
+STOCK_TAKE_STATUSES = frozenset(code for code, _ in StockTake.STATUS_CHOICES)
+
+def _apply_count_to_item(item, actual_quantity, notes, now):
+    """Set a posted count on a stock take item; return (changed, is_discrepant, is_uncounted)"""
+    changed = item.actual_quantity != actual_quantity or item.notes != notes
+    if changed:
+        item.actual_quantity = actual_quantity
+        item.notes = notes
+        # bulk_update() skips auto_now
+        item.updated_at = now
+    # Not counted yet when the quantity is 0
+    return changed, actual_quantity != item.expected_quantity, actual_quantity == 0
+
 @login_required
 @admin_required
 def stock_take_detail(request, pk):
     """View to show details of a stock take record"""
-    stock_take = get_object_or_404(StockTake, pk=pk)
-    items = stock_take.items.all()
+    stock_take = get_object_or_404(
+        StockTake.objects.select_related('department', 'created_by').only(*STOCK_TAKE_DETAIL_FIELDS), pk=pk
+    )
+    # The template shows each item's asset, so join it instead of loading it per row
+    items = stock_take.items.select_related('asset')
     
     if request.method == 'POST':
         try:
             with transaction.atomic():
-                for item in items:
-                    actual_quantity = int(request.POST.get(f'quantity_{item.id}', 0))
-                    notes = request.POST.get(f'notes_{item.id}', '')
-                    
-                    item.actual_quantity = actual_quantity
-                    item.notes = notes
-                    item.save()
+                # Lock the stock take and its items so concurrent submissions apply one after another
+                StockTake.objects.select_for_update().filter(pk=pk).values_list('pk', flat=True).get()
+                # Only the columns the count touches; these instances are mutated in place and
+                # written back below, so do not re-query the items after this point
+                locked_items = StockTakeItem.objects.filter(stock_take_id=pk).select_for_update().only(
+                    'id', 'expected_quantity', 'actual_quantity', 'notes'
+                )
                 
-                # Update stock take status
+                # Read the quantity_<id>/notes_<id> fields in one pass over the POST data
+                posted_quantities = {}
+                posted_notes = {}
+                for key, value in request.POST.items():
+                    field, _, item_id = key.rpartition('_')
+                    if not item_id.isdigit():
+                        continue
+                    if field == 'quantity':
+                        posted_quantities[int(item_id)] = int(value or 0)
+                    elif field == 'notes':
+                        posted_notes[int(item_id)] = value
+                
+                now = timezone.now()
+                changed_items = []
                 has_discrepancy = False
-                all_completed = True
+                has_uncounted = False
+                for item in locked_items:
+                    changed, is_discrepant, is_uncounted = _apply_count_to_item(
+                        item, posted_quantities.get(item.id, 0), posted_notes.get(item.id, ''), now
+                    )
+                    if changed:
+                        changed_items.append(item)
+                    # Track the status inputs while every item is in hand
+                    has_discrepancy |= is_discrepant
+                    has_uncounted |= is_uncounted
                 
-                for item in items:
-                    if item.actual_quantity != item.expected_quantity:
-                        has_discrepancy = True
-                        all_completed = False
-                        break
-                    elif item.actual_quantity == 0:  # If any item hasn't been counted
-                        all_completed = False
+                # Write back only the items whose values changed, in one batched UPDATE
+                StockTakeItem.objects.bulk_update(changed_items, ['actual_quantity', 'notes', 'updated_at'], batch_size=1000)
                 
+                # Update stock take status with a targeted UPDATE (update() skips auto_now)
                 if has_discrepancy:
-                    stock_take.status = 'discrepancy'
-                elif all_completed:
-                    stock_take.status = 'completed'
+                    status = 'discrepancy'
+                elif not has_uncounted:
+                    status = 'completed'
                 else:
-                    stock_take.status = 'in_progress'
+                    status = 'in_progress'
                 
-                stock_take.save()
+                StockTake.objects.filter(pk=pk).update(status=status, updated_at=now)
                 
                 messages.success(request, 'Stock take updated successfully!')
                 return redirect('stock_take_list')
@@ -853,21 +1020,23 @@ def stock_take_detail(request, pk):
 @admin_required
 def stock_take_update(request, pk):
     """View to update a stock take record"""
-    stock_take = get_object_or_404(StockTake, pk=pk)
-    
     if request.method == 'POST':
         notes = request.POST.get('notes', '')
         status = request.POST.get('status')
+        if status not in STOCK_TAKE_STATUSES:
+            messages.error(request, f"Error updating stock take record: invalid status '{status}'")
+            return redirect('stock_take_update', pk=pk)
         
         try:
-            stock_take.notes = notes
-            stock_take.status = status
-            stock_take.save()
-            messages.success(request, 'Stock take record updated successfully!')
-            return redirect('stock_take_detail', pk=stock_take.pk)
+            # Write just the edited columns without loading the row (update() skips auto_now);
+            # a missing record falls through to the 404 below
+            if StockTake.objects.filter(pk=pk).update(notes=notes, status=status, updated_at=timezone.now()):
+                messages.success(request, 'Stock take record updated successfully!')
+                return redirect('stock_take_detail', pk=pk)
         except Exception as e:
             messages.error(request, f'Error updating stock take record: {str(e)}')
     
+    stock_take = get_object_or_404(StockTake, pk=pk)
     return render(request, 'assets/stock_take_form.html', {
         'stock_take': stock_take,
         'action': 'Update'